@@ -0,0 +1,51 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+import prow_http
+
+PROWJOBS = {
+    "items": [
+        {
+            "metadata": {"name": "a"},
+            "spec": {"job": "periodic-e2e"},
+            "status": {"startTime": "2024-01-01T00:00:00Z", "build_id": "1", "state": "success"},
+        },
+        {
+            "metadata": {"name": "b"},
+            "spec": {"job": "periodic-e2e"},
+            "status": {"startTime": "2024-02-01T00:00:00Z", "build_id": "2"},
+        },
+    ]
+}
+
+
+def prowjobs_response(etag='"v1"', content=None):
+    body = json.dumps(PROWJOBS).encode() if content is None else content
+    return httpx.Response(
+        200, content=body, headers={"ETag": etag, "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}
+    )
+
+
+@pytest.fixture
+def prow(monkeypatch):
+    """Reset the module state and route the shared client to queued mock responses."""
+    server = SimpleNamespace(
+        requests=[], responses=[], now=0.0, prowjobs_response=prowjobs_response
+    )
+
+    def handler(request):
+        server.requests.append(request)
+        return server.responses.pop(0)
+
+    monkeypatch.setattr(prow_http, "_CLIENT", httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    monkeypatch.setattr(prow_http, "_PROWJOBS_CACHE", None)
+    monkeypatch.setattr(prow_http, "_PROWJOBS_LOCK", asyncio.Lock())
+    monkeypatch.setattr(prow_http, "_PROWJOBS_ETAG", None)
+    monkeypatch.setattr(prow_http, "_PROWJOBS_LAST_MODIFIED", None)
+    monkeypatch.setattr(prow_http, "_JOB_INDEX", {})
+    monkeypatch.setattr(prow_http, "time", SimpleNamespace(monotonic=lambda: server.now))
+    return server
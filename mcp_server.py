@@ -1,35 +1,15 @@
 import os
-from typing import Any
-from dateutil.parser import parse as parse_date
 
-import httpx
+import anyio
 from mcp.server.fastmcp import FastMCP
 
-mcp = FastMCP("mcp-server")
+from prow_http import close_client, get_prowjobs, lookup_job, request_text
 
-PROW_URL = "https://prow.ci.openshift.org"
 GCS_URL = "https://gcsweb-ci.apps.ci.l2s4.p1.openshiftapps.com/gcs/test-platform-results/logs/"
+# get_build_logs states this cap in its docstring (the tool description), keep both in sync
+BUILD_LOG_MAX_BYTES = 256 * 1024
 
-async def make_request(
-    url: str, method: str = "GET", data: dict[str, Any] = None
-) -> dict[str, Any] | None:
-    api_key = os.environ.get("API_KEY")
-    if api_key:
-        headers = {
-            "Authorization": f"Bearer {api_key}",
-            "Accept": "application/json",
-        }
-    else:
-        headers = {}
-
-    async with httpx.AsyncClient() as client:
-        if method.upper() == "GET":
-            response = await client.request(method, url, headers=headers, params=data)
-        else:
-            response = await client.request(method, url, headers=headers, json=data)
-        response.raise_for_status()
-        return response.json()
-
+mcp = FastMCP("mcp-server")
 
 
 @mcp.tool()
@@ -40,32 +20,34 @@ async def get_latest_job_run(job_name: str):
         job_name: The name of the Prow job to query
         
     Returns:
-        Dictionary containing job information including ID, state, start time, completion time, and URL
+        Dictionary containing job information including ID, state, start time, completion time, URL,
+        build ID and job name
     """
-    url = f"{PROW_URL}/prowjobs.js"
     try:
-        response = await make_request(url)
+        response = await get_prowjobs()
         if not response:
             return {"error": "No response from Prow API"}
             
         prowjobs = response.get("items", [])
 
-        # Filter by job name
-        matching_jobs = [
-            job for job in prowjobs
-            if job.get("spec", {}).get("job") == job_name and "startTime" in job.get("status", {})
-        ]
-
-        if not matching_jobs:
+        # Single pass over the jobs, keeping the most recent match.
+        # Prow startTime values are ISO-8601 UTC, so they order correctly as strings
+        latest = None
+        latest_start = ""
+        for job in prowjobs:
+            if job["spec"]["job"] != job_name:
+                continue
+            try:
+                start_time = job["status"]["startTime"]
+            except KeyError:
+                continue
+            if start_time and start_time > latest_start:
+                latest = job
+                latest_start = start_time
+
+        if latest is None:
             return {"error": f"No matching job found for: {job_name}"}
 
-        # Sort by startTime descending
-        matching_jobs.sort(
-            key=lambda job: parse_date(job["status"]["startTime"]),
-            reverse=True
-        )
-
-        latest = matching_jobs[0]
         status = latest.get("status", {})
 
         return {
@@ -74,47 +56,47 @@ async def get_latest_job_run(job_name: str):
             "start": status.get("startTime"),
             "completion": status.get("completionTime"),
             "url": status.get("url"),
-            "build_id": status.get("build_id")
+            "build_id": status.get("build_id"),
+            "job_name": job_name
         }
     except Exception as e:
         return {"error": f"Failed to fetch job info: {str(e)}"}
 
 
 @mcp.tool()
-async def get_job_logs(job_id: str):
+async def get_job_logs(job_id: str, build_id: str | None = None, job_name: str | None = None):
     """Get the logs for a specific Prow job ID.
     
     Args:
         job_id: The ID of the job to get logs for
+        build_id: Optional build ID of the job, as returned by get_latest_job_run
+        job_name: Optional job name, as returned by get_latest_job_run
         
     Returns:
         Dictionary containing the job logs or error information
     """
-    url = f"{PROW_URL}/prowjobs.js"
+    # Both are already known from a previous get_latest_job_run, no need to look the job up
+    if build_id and job_name:
+        return await get_build_logs(job_name, build_id)
+
+    # Any job listed by an earlier prowjobs.js download is found without fetching it again
+    known = lookup_job(job_id)
+    if known:
+        job_name, build_id = known
+        return await get_build_logs(job_name, build_id)
+
     try:
-        response = await make_request(url)
+        # Not indexed yet, refreshing prowjobs.js rebuilds the index
+        response = await get_prowjobs()
         if not response:
             return {"error": "No response from Prow API"}
-            
-        prowjobs = response.get("items", [])
-
-        # Find the job with matching ID
-        matching_job = next(
-            (job for job in prowjobs if job["metadata"]["name"] == job_id),
-            None
-        )
 
-        if not matching_job:
-            return {"error": f"No job found with ID: {job_id}"}
-
-        # Get the build logs URL
-        status = matching_job.get("status", {})
-        build_id = status.get("build_id")
-        job_name = matching_job.get("spec", {}).get("job")
-        
-        if not build_id or not job_name:
-            return {"error": "Could not find build ID or job name"}
+        known = lookup_job(job_id)
+        if not known:
+            # Jobs without a build ID or job name are left out of the index
+            return {"error": f"No job with a build ID and job name found for ID: {job_id}"}
 
+        job_name, build_id = known
         return await get_build_logs(job_name, build_id)
             
     except Exception as e:
@@ -130,22 +112,24 @@ async def get_build_logs(job_name: str, build_id: str):
         build_id: The build ID to get logs for
         
     Returns:
-        Dictionary containing the job logs or error information
+        Dictionary containing the job logs or error information. Only the last 256 KiB
+        of the log are returned, "truncated" is set when the start was dropped
     """
     try:
         # Construct the artifacts URL
         artifacts_url = f"{GCS_URL}/{job_name}/{build_id}/artifacts"
         
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"{artifacts_url}/build-log.txt")
-            response.raise_for_status()
-            logs = response.text
-            return {
-                "build_id": build_id,
-                "job_name": job_name,
-                "logs": logs,
-                "artifacts_url": artifacts_url
-            }
+        # Build logs can be many MB, only keep the tail instead of loading the whole body
+        logs, truncated = await request_text(
+            f"{artifacts_url}/build-log.txt", max_bytes=BUILD_LOG_MAX_BYTES
+        )
+        return {
+            "build_id": build_id,
+            "job_name": job_name,
+            "logs": logs,
+            "truncated": truncated,
+            "artifacts_url": artifacts_url
+        }
     except Exception as e:
         return {
             "error": f"Failed to fetch logs: {str(e)}",
@@ -153,5 +137,21 @@ async def get_build_logs(job_name: str, build_id: str):
         }
 
 
+async def main(transport: str) -> None:
+    runners = {
+        "stdio": mcp.run_stdio_async,
+        "sse": mcp.run_sse_async,
+        "streamable-http": mcp.run_streamable_http_async,
+    }
+    if transport not in runners:
+        raise ValueError(f"Unknown transport: {transport}")
+    try:
+        await runners[transport]()
+    finally:
+        # The client is shared by every session, so it is only closed once the server exits,
+        # and on this loop since its pooled connections belong to it
+        await close_client()
+
+
 if __name__ == "__main__":
-    mcp.run(transport=os.environ.get("MCP_TRANSPORT", "stdio"))
+    anyio.run(main, os.environ.get("MCP_TRANSPORT", "stdio"))
@@ -0,0 +1,154 @@
+import asyncio
+import importlib.util
+import os
+import time
+from typing import Any
+
+import httpx
+import ijson
+from httpx._utils import get_environment_proxies
+
+PROW_URL = "https://prow.ci.openshift.org"
+# Read once at import, the key does not change while the server runs
+_API_KEY = os.environ.get("API_KEY")
+_AUTH = {"Authorization": f"Bearer {_API_KEY}"} if _API_KEY else {}
+
+# One client for every tool so keep-alive connections to Prow and GCS are reused across calls
+_CLIENT: httpx.AsyncClient | None = None
+_LIMITS = httpx.Limits(max_connections=1000, max_keepalive_connections=100, keepalive_expiry=30.0)
+# HTTP/2 needs the h2 package (httpx[http2]), servers without it are negotiated down to HTTP/1.1
+_HTTP2 = importlib.util.find_spec("h2") is not None
+
+
+def _transport(proxy: str | None = None) -> httpx.AsyncHTTPTransport:
+    # Limits must be set on the transport, the client ignores them once a transport is given
+    return httpx.AsyncHTTPTransport(retries=2, limits=_LIMITS, http2=_HTTP2, proxy=proxy)
+
+
+def get_client() -> httpx.AsyncClient:
+    global _CLIENT
+    if _CLIENT is None or _CLIENT.is_closed:
+        # An explicit transport disables httpx's HTTP(S)_PROXY/NO_PROXY handling, so mount the
+        # environment proxies ourselves; a None mount (NO_PROXY) falls back to the default transport
+        mounts = {
+            pattern: None if proxy is None else _transport(proxy)
+            for pattern, proxy in get_environment_proxies().items()
+        }
+        _CLIENT = httpx.AsyncClient(
+            transport=_transport(),
+            mounts=mounts,
+            timeout=30,
+            headers={"Accept": "application/json"},
+        )
+    return _CLIENT
+
+
+async def close_client() -> None:
+    if _CLIENT is not None:
+        await _CLIENT.aclose()
+
+
+async def request_text(url: str, max_bytes: int | None = None) -> tuple[str, bool]:
+    """Stream a text body, keeping only its last max_bytes if given.
+
+    Returns the decoded text and whether anything was dropped from its start.
+    """
+    buf = bytearray()
+    truncated = False
+    # The client defaults to Accept: application/json, which is wrong for a text body
+    async with get_client().stream("GET", url, headers={"Accept": "*/*"}) as response:
+        response.raise_for_status()
+        async for chunk in response.aiter_bytes(65536):
+            buf += chunk
+            if max_bytes is not None and len(buf) > max_bytes:
+                del buf[:-max_bytes]
+                truncated = True
+    return buf.decode("utf-8", errors="replace"), truncated
+
+
+# prowjobs.js is large and usually fetched by several tools in a row, keep it briefly
+PROWJOBS_TTL = 10.0
+_PROWJOBS_CACHE: tuple[float, dict[str, Any]] | None = None
+_PROWJOBS_LOCK = asyncio.Lock()
+# Validators of the cached payload, sent back so an unchanged prowjobs.js costs no body
+_PROWJOBS_ETAG: str | None = None
+_PROWJOBS_LAST_MODIFIED: str | None = None
+# job ID -> (job name, build ID) from the last full prowjobs.js download
+_JOB_INDEX: dict[str, tuple[str, str]] = {}
+# The only status fields the tools read, everything else in a ProwJob is dropped
+_STATUS_FIELDS = ("state", "startTime", "completionTime", "url", "build_id")
+
+
+def _slim_job(job: dict[str, Any]) -> dict[str, Any]:
+    status = job.get("status", {})
+    return {
+        "metadata": {"name": job.get("metadata", {}).get("name")},
+        "spec": {"job": job.get("spec", {}).get("job")},
+        "status": {key: status[key] for key in _STATUS_FIELDS if key in status},
+    }
+
+
+def _index_jobs(jobs: list[dict[str, Any]]) -> dict[str, tuple[str, str]]:
+    index = {}
+    for job in jobs:
+        job_id = job["metadata"]["name"]
+        job_name = job["spec"]["job"]
+        build_id = job["status"].get("build_id")
+        if job_id and job_name and build_id:
+            index[job_id] = (job_name, build_id)
+    return index
+
+
+def lookup_job(job_id: str) -> tuple[str, str] | None:
+    """Return the (job name, build ID) of a job seen in prowjobs.js, without fetching it."""
+    return _JOB_INDEX.get(job_id)
+
+
+async def _fetch_prowjobs(cached: dict[str, Any] | None = None) -> dict[str, Any]:
+    """Stream prowjobs.js, parsing one item at a time instead of the whole payload.
+
+    When a previous payload is given, the request is made conditional on its
+    ETag/Last-Modified and that payload is returned as is if Prow answers 304.
+    """
+    global _PROWJOBS_ETAG, _PROWJOBS_LAST_MODIFIED, _JOB_INDEX
+    headers = dict(_AUTH)
+    if cached is not None:
+        if _PROWJOBS_ETAG:
+            headers["If-None-Match"] = _PROWJOBS_ETAG
+        if _PROWJOBS_LAST_MODIFIED:
+            headers["If-Modified-Since"] = _PROWJOBS_LAST_MODIFIED
+
+    items = ijson.sendable_list()
+    parser = ijson.items_coro(items, "items.item")
+    jobs = []
+    async with get_client().stream("GET", f"{PROW_URL}/prowjobs.js", headers=headers) as response:
+        # 304 has no body, check it before raise_for_status which rejects any non-2xx
+        if response.status_code == 304 and cached is not None:
+            return cached
+        response.raise_for_status()
+        async for chunk in response.aiter_bytes():
+            parser.send(chunk)
+            jobs.extend(_slim_job(job) for job in items)
+            del items[:]
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+    parser.close()
+    jobs.extend(_slim_job(job) for job in items)
+    _PROWJOBS_ETAG = etag
+    _PROWJOBS_LAST_MODIFIED = last_modified
+    _JOB_INDEX = _index_jobs(jobs)
+    return {"items": jobs}
+
+
+async def get_prowjobs() -> dict[str, Any] | None:
+    global _PROWJOBS_CACHE
+    async with _PROWJOBS_LOCK:
+        cached = None
+        if _PROWJOBS_CACHE is not None:
+            if time.monotonic() - _PROWJOBS_CACHE[0] < PROWJOBS_TTL:
+                return _PROWJOBS_CACHE[1]
+            cached = _PROWJOBS_CACHE[1]
+        response = await _fetch_prowjobs(cached)
+        if response:
+            _PROWJOBS_CACHE = (time.monotonic(), response)
+        return response
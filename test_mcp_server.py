@@ -0,0 +1,147 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import anyio
+import httpx
+import pytest
+
+import mcp_server
+import prow_http
+
+
+def _build_log_response():
+    return httpx.Response(200, content=b"build log")
+
+
+def test_get_latest_job_run_returns_the_most_recent_run(prow):
+    prow.responses.append(prow.prowjobs_response())
+
+    result = asyncio.run(mcp_server.get_latest_job_run("periodic-e2e"))
+
+    assert result["job_id"] == "b"
+    assert result["start"] == "2024-02-01T00:00:00Z"
+    assert (result["job_name"], result["build_id"]) == ("periodic-e2e", "2")
+
+
+def test_get_latest_job_run_skips_other_jobs_and_runs_without_start(prow):
+    jobs = {
+        "items": [
+            {
+                "metadata": {"name": "old"},
+                "spec": {"job": "periodic-e2e"},
+                "status": {"startTime": "2024-01-01T00:00:00Z", "build_id": "1"},
+            },
+            {"metadata": {"name": "pending"}, "spec": {"job": "periodic-e2e"}, "status": {}},
+            {
+                "metadata": {"name": "other"},
+                "spec": {"job": "periodic-unit"},
+                "status": {"startTime": "2025-01-01T00:00:00Z", "build_id": "9"},
+            },
+        ]
+    }
+    prow.responses.append(prow.prowjobs_response(content=json.dumps(jobs).encode()))
+
+    result = asyncio.run(mcp_server.get_latest_job_run("periodic-e2e"))
+
+    assert result["job_id"] == "old"
+
+
+def test_get_latest_job_run_without_match(prow):
+    prow.responses.append(prow.prowjobs_response())
+
+    result = asyncio.run(mcp_server.get_latest_job_run("periodic-missing"))
+
+    assert result == {"error": "No matching job found for: periodic-missing"}
+
+
+def test_get_job_logs_with_build_id_and_job_name_skips_prowjobs_fetch(prow):
+    prow.responses.append(_build_log_response())
+
+    result = asyncio.run(mcp_server.get_job_logs("x", build_id="2", job_name="periodic-e2e"))
+
+    assert result["logs"] == "build log"
+    assert [request.url.path for request in prow.requests] == [
+        "/gcs/test-platform-results/logs//periodic-e2e/2/artifacts/build-log.txt"
+    ]
+
+
+def test_get_job_logs_index_hit_skips_prowjobs_fetch(prow, monkeypatch):
+    monkeypatch.setattr(mcp_server, "lookup_job", {"b": ("periodic-e2e", "2")}.get)
+    prow.responses.append(_build_log_response())
+
+    result = asyncio.run(mcp_server.get_job_logs("b"))
+
+    assert result["logs"] == "build log"
+    assert [request.url.path for request in prow.requests] == [
+        "/gcs/test-platform-results/logs//periodic-e2e/2/artifacts/build-log.txt"
+    ]
+
+
+def test_get_job_logs_index_miss_refreshes_then_uses_index(prow):
+    prow.responses += [prow.prowjobs_response(), _build_log_response()]
+
+    result = asyncio.run(mcp_server.get_job_logs("b"))
+    assert (result["job_name"], result["build_id"]) == ("periodic-e2e", "2")
+    # Known now, even once the cached payload has expired
+    prow.now = 100.0
+    prow.responses.append(_build_log_response())
+    asyncio.run(mcp_server.get_job_logs("a"))
+
+    paths = [request.url.path for request in prow.requests]
+    assert paths.count("/prowjobs.js") == 1
+    assert len(paths) == 3
+
+
+def test_get_job_logs_unknown_job(prow):
+    prow.responses.append(prow.prowjobs_response())
+
+    result = asyncio.run(mcp_server.get_job_logs("missing"))
+
+    assert "missing" in result["error"]
+
+
+@pytest.fixture
+def local_server():
+    """A real HTTP server, so the pooled client holds actual socket connections."""
+
+    class Handler(BaseHTTPRequestHandler):
+        # Keep-alive, so the connection stays in the pool until the client is closed
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            body = b"build log"
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_main_closes_client_after_requests_on_the_same_loop(local_server, monkeypatch):
+    monkeypatch.setenv("NO_PROXY", "*")
+    monkeypatch.setattr(prow_http, "_CLIENT", None)
+
+    async def run_stdio_async():
+        assert await prow_http.request_text(f"{local_server}/build-log.txt") == ("build log", False)
+
+    monkeypatch.setattr(mcp_server.mcp, "run_stdio_async", run_stdio_async)
+
+    anyio.run(mcp_server.main, "stdio")
+
+    assert prow_http._CLIENT.is_closed
+
+
+def test_main_rejects_unknown_transport():
+    with pytest.raises(ValueError, match="Unknown transport"):
+        anyio.run(mcp_server.main, "carrier-pigeon")
@@ -0,0 +1,127 @@
+import asyncio
+import json
+
+import httpcore
+import httpx
+import ijson
+import pytest
+
+import prow_http
+
+
+def test_get_prowjobs_keeps_only_the_fields_tools_read(prow):
+    prow.responses.append(prow.prowjobs_response())
+
+    jobs = asyncio.run(prow_http.get_prowjobs())["items"]
+
+    assert jobs[0] == {
+        "metadata": {"name": "a"},
+        "spec": {"job": "periodic-e2e"},
+        "status": {"startTime": "2024-01-01T00:00:00Z", "build_id": "1", "state": "success"},
+    }
+    assert len(jobs) == 2
+
+
+def test_get_prowjobs_is_cached_within_ttl(prow):
+    prow.responses.append(prow.prowjobs_response())
+
+    first = asyncio.run(prow_http.get_prowjobs())
+    prow.now = prow_http.PROWJOBS_TTL - 1
+    second = asyncio.run(prow_http.get_prowjobs())
+
+    assert first is second
+    assert len(prow.requests) == 1
+
+
+def test_not_modified_returns_cached_payload_and_restarts_ttl(prow):
+    prow.responses += [prow.prowjobs_response(), httpx.Response(304)]
+
+    first = asyncio.run(prow_http.get_prowjobs())
+    prow.now = prow_http.PROWJOBS_TTL + 1
+    second = asyncio.run(prow_http.get_prowjobs())
+    # Still fresh, counted from the 304 rather than from the first download
+    prow.now = 2 * prow_http.PROWJOBS_TTL
+    third = asyncio.run(prow_http.get_prowjobs())
+
+    assert first is second is third
+    assert len(prow.requests) == 2
+    revalidation = prow.requests[1]
+    assert revalidation.headers["If-None-Match"] == '"v1"'
+    assert revalidation.headers["If-Modified-Since"] == "Mon, 01 Jan 2024 00:00:00 GMT"
+
+
+def test_first_request_is_not_conditional(prow):
+    prow.responses.append(prow.prowjobs_response())
+
+    asyncio.run(prow_http.get_prowjobs())
+
+    assert "If-None-Match" not in prow.requests[0].headers
+    assert "If-Modified-Since" not in prow.requests[0].headers
+
+
+def test_failed_parse_keeps_previous_validators_and_payload(prow):
+    prow.responses += [
+        prow.prowjobs_response(),
+        prow.prowjobs_response(etag='"v2"', content=b'{"items": [{"metadata": '),
+    ]
+
+    first = asyncio.run(prow_http.get_prowjobs())
+    prow.now = prow_http.PROWJOBS_TTL + 1
+    with pytest.raises(ijson.JSONError):
+        asyncio.run(prow_http.get_prowjobs())
+
+    assert prow_http._PROWJOBS_ETAG == '"v1"'
+    assert prow_http._PROWJOBS_CACHE[1] is first
+
+
+def test_request_text_keeps_only_the_tail(prow):
+    prow.responses.append(httpx.Response(200, content=b"0123456789abcdefghij"))
+
+    text, truncated = asyncio.run(prow_http.request_text("https://gcs.example/log", max_bytes=10))
+
+    assert (text, truncated) == ("abcdefghij", True)
+    assert prow.requests[0].headers["Accept"] == "*/*"
+
+
+def test_request_text_without_cap_returns_everything(prow):
+    prow.responses.append(httpx.Response(200, content=b"short log"))
+
+    assert asyncio.run(prow_http.request_text("https://gcs.example/log")) == ("short log", False)
+
+
+def test_lookup_job_uses_the_index_from_the_last_download(prow):
+    prow.responses.append(prow.prowjobs_response())
+
+    assert prow_http.lookup_job("b") is None
+    asyncio.run(prow_http.get_prowjobs())
+
+    assert prow_http.lookup_job("a") == ("periodic-e2e", "1")
+    assert prow_http.lookup_job("b") == ("periodic-e2e", "2")
+    assert prow_http.lookup_job("missing") is None
+
+
+def test_index_skips_jobs_without_build_id(prow):
+    jobs = {"items": [{"metadata": {"name": "pending"}, "spec": {"job": "periodic-e2e"}, "status": {}}]}
+    prow.responses.append(prow.prowjobs_response(content=json.dumps(jobs).encode()))
+
+    asyncio.run(prow_http.get_prowjobs())
+
+    assert prow_http.lookup_job("pending") is None
+
+
+def test_client_routes_env_proxies_and_no_proxy(monkeypatch):
+    for name in ("HTTP_PROXY", "ALL_PROXY", "http_proxy", "https_proxy", "all_proxy", "no_proxy"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("HTTPS_PROXY", "http://proxy.example:3128")
+    monkeypatch.setenv("NO_PROXY", "internal.example")
+    monkeypatch.setattr(prow_http, "_CLIENT", None)
+
+    client = prow_http.get_client()
+    proxied = client._transport_for_url(httpx.URL("https://prow.ci.openshift.org/prowjobs.js"))
+    direct = client._transport_for_url(httpx.URL("https://internal.example/build-log.txt"))
+
+    assert isinstance(proxied._pool, httpcore.AsyncHTTPProxy)
+    assert proxied._pool._proxy_url.host == b"proxy.example"
+    assert direct is client._transport
+    assert isinstance(direct._pool, httpcore.AsyncConnectionPool)
+    assert direct._pool._retries == 2
@@ -1,5 +1,4 @@
 import requests
-from dateutil.parser import parse as parse_date
 
 prow_url = "https://prow.ci.openshift.org"
 
@@ -11,23 +10,22 @@ def get_latest_job_run(prow_url, job_name):
 
     prowjobs = response.json().get("items", [])
 
-    # Filter by job name
-    matching_jobs = [
-        job for job in prowjobs
-        if job.get("spec", {}).get("job") == job_name and "startTime" in job.get("status", {})
-    ]
-
-    if not matching_jobs:
+    # Single pass over the jobs, keeping the most recent match.
+    # Prow startTime values are ISO-8601 UTC, so they order correctly as strings
+    latest = None
+    latest_start = ""
+    for job in prowjobs:
+        if job.get("spec", {}).get("job") != job_name:
+            continue
+        start_time = job.get("status", {}).get("startTime")
+        if start_time and start_time > latest_start:
+            latest = job
+            latest_start = start_time
+
+    if latest is None:
         print(f"No matching job found for: {job_name}")
         return None
 
-    # Sort by startTime descending
-    matching_jobs.sort(
-        key=lambda job: parse_date(job["status"]["startTime"]),
-        reverse=True
-    )
-
-    latest = matching_jobs[0]
     status = latest.get("status", {})
 
     return {